@@ -1,7 +1,14 @@
 from langchain_core.messages import HumanMessage
 from agent.graph import agent_graph
 from agent.state import AgentState
+from core import rag_manager, cache_manager
+from config import settings
 from typing import Dict, Any, AsyncGenerator
+import asyncio
+import re
+
+# A word together with its surrounding whitespace
+_WORD_PATTERN = re.compile(r"\s*\S+\s*")
 
 
 class AgentExecutor:
@@ -10,55 +17,83 @@ class AgentExecutor:
     
     async def execute(self, user_input: str, session_id: str = "default") -> Dict[str, Any]:
         """Execute the agent with user input."""
+        embedding = None
+        if settings.semantic_cache_enabled:
+            # Embedded once here and handed to retrieval through the state
+            embedding = await rag_manager.aembed_query(user_input)
+            cached = await cache_manager.semantic_get(
+                embedding,
+                threshold=settings.semantic_cache_threshold
+            )
+            if cached is not None:
+                return {**cached, "session_id": session_id}
+        
         initial_state: AgentState = {
             "messages": [HumanMessage(content=user_input)],
             "context": "",
-            "next_action": ""
+            "next_action": "",
+            "query_embedding": embedding
         }
         
         result = await self.graph.ainvoke(initial_state)
-        
-        return {
+        response = {
             "response": result["messages"][-1].content if result["messages"] else "",
-            "context": result.get("context", ""),
-            "session_id": session_id
+            "context": result.get("context", "")
         }
+        
+        if embedding is not None:
+            await cache_manager.semantic_set(embedding, response)
+        
+        return {**response, "session_id": session_id}
     
     async def execute_stream(self, user_input: str, session_id: str = "default") -> AsyncGenerator[Dict[str, Any], None]:
-        """Execute the agent with streaming output."""
+        """Execute the agent, yielding LLM tokens as they are generated."""
         initial_state: AgentState = {
             "messages": [HumanMessage(content=user_input)],
             "context": "",
-            "next_action": ""
+            "next_action": "",
+            "query_embedding": None
         }
         
-        result = await self.graph.ainvoke(initial_state)
-        response = result["messages"][-1].content if result["messages"] else ""
-        total_length = len(response)
+        streamed = False
+        final_state = None
         
-        for i, char in enumerate(response):
-            yield {
-                "chunk": char,
-                "done": i == len(response) - 1,
-                "progress": (i + 1) / total_length,
-                "session_id": session_id
-            }
-    
-    def execute_sync(self, user_input: str, session_id: str = "default") -> Dict[str, Any]:
-        """Synchronous execution of the agent."""
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=user_input)],
-            "context": "",
-            "next_action": ""
-        }
+        async for event in self.graph.astream_events(initial_state, version="v2"):
+            if event["event"] == "on_chat_model_stream":
+                chunk = event["data"]["chunk"].content
+                if chunk:
+                    streamed = True
+                    yield {
+                        "chunk": chunk,
+                        "done": False,
+                        "session_id": session_id
+                    }
+            elif event["event"] == "on_chain_end" and not event["parent_ids"]:
+                final_state = event["data"]["output"]
         
-        result = self.graph.invoke(initial_state)
+        # Providers without token streaming only produce the final message
+        if not streamed and final_state and final_state["messages"]:
+            for word in _WORD_PATTERN.findall(final_state["messages"][-1].content):
+                yield {
+                    "chunk": word,
+                    "done": False,
+                    "session_id": session_id
+                }
         
-        return {
-            "response": result["messages"][-1].content if result["messages"] else "",
-            "context": result.get("context", ""),
+        yield {
+            "chunk": "",
+            "done": True,
             "session_id": session_id
         }
+    
+    async def invalidate_caches(self):
+        """Drop cached answers after the knowledge base changes."""
+        await cache_manager.semantic_clear()
+    
+    def execute_sync(self, user_input: str, session_id: str = "default") -> Dict[str, Any]:
+        """Synchronous execution of the agent."""
+        # Graph nodes are async, so the sync path drives the async one.
+        return asyncio.run(self.execute(user_input, session_id))
 
 
 agent_executor = AgentExecutor()
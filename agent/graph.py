@@ -3,11 +3,17 @@ from agent.state import AgentState
 from agent.nodes import retrieval_node, agent_node, tool_node
 
 
+def _route_after_agent(state: AgentState) -> str:
+    return state["next_action"]
+
+
 def create_agent_graph():
     """Create the agent workflow graph."""
     workflow = StateGraph(AgentState)
     
     # Add nodes
+    # Retrieval is cached in Redis by retrieval_node and in RAGManager's
+    # bounded results cache; both are invalidated on ingest
     workflow.add_node("retrieval", retrieval_node)
     workflow.add_node("agent", agent_node)
     workflow.add_node("tools", tool_node)
@@ -16,16 +22,10 @@ def create_agent_graph():
     workflow.set_entry_point("retrieval")
     workflow.add_edge("retrieval", "agent")
     
-    # Conditional routing
-    def should_continue(state: AgentState) -> str:
-        next_action = state.get("next_action", "end")
-        if next_action == "tools":
-            return "tools"
-        return "end"
-    
+    # Conditional routing: agent_node always sets next_action
     workflow.add_conditional_edges(
         "agent",
-        should_continue,
+        _route_after_agent,
         {
             "tools": "tools",
             "end": END
@@ -1,30 +1,55 @@
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from agent.state import AgentState
-from agent.prompts import get_system_prompt
-from core import ModelManager, rag_manager, tool_registry
+from agent.prompts import get_system_prompt, EMPTY_CONTEXT_PROMPT
+from core import ModelManager, rag_manager, tool_registry, cache_manager
+from config import settings
+import hashlib
 
+# Reused for every turn without retrieved context
+_EMPTY_SYSTEM_MESSAGE = SystemMessage(content=EMPTY_CONTEXT_PROMPT)
 
-def retrieval_node(state: AgentState) -> AgentState:
-    """Retrieve relevant context from RAG."""
+
+async def retrieval_node(state: AgentState) -> AgentState:
+    """Retrieve relevant context from RAG, reusing cached results for repeated queries."""
     messages = state["messages"]
     last_message = messages[-1].content if messages else ""
     
-    docs = rag_manager.similarity_search(last_message, k=3)
-    context = "\n".join([doc.page_content for doc in docs])
+    contents = cache_key = None
+    if settings.redis_enabled:
+        # The generation changes on every ingest, so stale entries are never read
+        generation = await rag_manager.generation.aget()
+        cache_key = f"rag:{generation}:{hashlib.sha256(last_message.encode()).hexdigest()[:16]}"
+        contents = await cache_manager.get(cache_key)
+    
+    if contents is None:
+        docs = await rag_manager.asimilarity_search(
+            last_message,
+            k=3,
+            embedding=state.get("query_embedding")
+        )
+        contents = [doc.page_content for doc in docs]
+        if cache_key:
+            await cache_manager.set(cache_key, contents, ttl=settings.rag_cache_ttl)
     
-    return {"context": context}
+    return {"context": "\n".join(contents)}
 
 
-def agent_node(state: AgentState) -> AgentState:
+async def agent_node(state: AgentState) -> AgentState:
     """Main agent reasoning node."""
     llm = ModelManager.get_llm()
     messages = state["messages"]
     context = state.get("context", "")
     
-    system_prompt = get_system_prompt(context=context)
-    full_messages = [SystemMessage(content=system_prompt)] + list(messages)
+    if context:
+        system_message = SystemMessage(content=get_system_prompt(context=context))
+    else:
+        system_message = _EMPTY_SYSTEM_MESSAGE
+    full_messages = [system_message] + list(messages)
     
-    response = llm.invoke(full_messages)
+    # Stream so token events reach astream_events consumers as they arrive
+    response = None
+    async for chunk in llm.astream(full_messages):
+        response = chunk if response is None else response + chunk
     
     return {"messages": [response], "next_action": "end"}
 
@@ -15,6 +15,14 @@ Context: {context}
 """
 
 
+# Split once so each call is a plain concatenation instead of a format() parse
+_PROMPT_PREFIX, _PROMPT_SUFFIX = SYSTEM_PROMPT.split("{context}")
+
+EMPTY_CONTEXT_PROMPT = _PROMPT_PREFIX + _PROMPT_SUFFIX
+
+
 def get_system_prompt(context: str = "") -> str:
     """Get the system prompt with optional context."""
-    return SYSTEM_PROMPT.format(context=context)
+    if not context:
+        return EMPTY_CONTEXT_PROMPT
+    return _PROMPT_PREFIX + context + _PROMPT_SUFFIX
@@ -1,9 +1,11 @@
-from typing import TypedDict, Annotated, Sequence
+from typing import TypedDict, Annotated, List, Optional, Sequence
 from langchain_core.messages import BaseMessage
-from operator import add
+from langgraph.graph.message import add_messages
 
 
 class AgentState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], add]
+    messages: Annotated[Sequence[BaseMessage], add_messages]
     context: str
     next_action: str
+    # Embedding of the user query when the caller already computed it
+    query_embedding: Optional[List[float]]
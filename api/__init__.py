@@ -1,8 +1,9 @@
-from .routes import router
+from .routes import router, limiter
 from .schemas import ChatRequest, ChatResponse, DocumentRequest, DocumentResponse
 
 __all__ = [
     "router",
+    "limiter",
     "ChatRequest",
     "ChatResponse",
     "DocumentRequest",
@@ -6,10 +6,20 @@ from api.schemas import ChatRequest, ChatResponse, DocumentRequest, DocumentResp
 from agent import agent_executor
 from core import rag_manager, memory_manager
 from config import settings
-import json
-import asyncio
+import orjson
 
-limiter = Limiter(key_func=get_remote_address)
+# Shared across workers via Redis; the fixed-window strategy counts each hit
+# with a single atomic INCR+EXPIRE Lua script (one round-trip).
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=(
+        f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
+        if settings.redis_enabled else "memory://"
+    ),
+    strategy="fixed-window",
+    in_memory_fallback_enabled=True,
+    enabled=settings.rate_limit_enabled
+)
 
 router = APIRouter()
 
@@ -31,17 +41,23 @@ async def chat(request: Request, chat_request: ChatRequest):
 @router.post("/chat/stream")
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def chat_stream(request: Request, chat_request: ChatRequest):
-    """Streaming chat endpoint for agent interaction."""
+    """Streaming chat endpoint for agent interaction.
+    
+    Chunks are flushed as soon as the LLM emits them. Reverse proxies must not
+    buffer this route, e.g. for Nginx:
+    
+        proxy_buffering off;
+        gzip off;
+    """
     async def generate():
         try:
             async for chunk in agent_executor.execute_stream(
                 user_input=chat_request.message,
                 session_id=chat_request.session_id
             ):
-                yield f"data: {json.dumps(chunk)}\n\n"
-                await asyncio.sleep(0.005)
+                yield b"data: " + orjson.dumps(chunk) + b"\n\n"
         except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield b"data: " + orjson.dumps({"error": str(e)}) + b"\n\n"
     
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -51,10 +67,12 @@ async def chat_stream(request: Request, chat_request: ChatRequest):
 async def add_documents(request: Request, doc_request: DocumentRequest):
     """Add documents to the RAG system."""
     try:
-        count = rag_manager.add_texts(
+        count = await rag_manager.aadd_texts(
             texts=doc_request.texts,
             metadatas=doc_request.metadatas
         )
+        # Cached answers and retrieval may no longer reflect the knowledge base
+        await agent_executor.invalidate_caches()
         return DocumentResponse(
             count=count,
             message=f"Successfully added {count} document chunks"
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 
 
@@ -14,8 +14,10 @@ class ChatResponse(BaseModel):
 
 
 class DocumentRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
     texts: List[str] = Field(..., description="List of text documents to add")
-    metadata: Optional[List[dict]] = None
+    metadatas: Optional[List[dict]] = None
 
 
 class DocumentResponse(BaseModel):
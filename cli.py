@@ -58,38 +58,17 @@ class AgentCLI:
                 console.print("\n[bold cyan]🤖 Agent[/bold cyan]")
                 console.print("─" * 80, style="dim")
                 
-                first_chunk_received = False
-                spinner = None
-                word_buffer = []
-                char_count = 0
-                
                 for line in response.iter_lines():
                     if line.startswith("data: "):
-                        if not first_chunk_received:
-                            first_chunk_received = True
-                        
                         data = json.loads(line[6:])
                         if "error" in data:
                             console.print(f"\n[red]✗ {data['error']}[/red]\n")
                             return
                         
+                        # Chunks are LLM tokens, print them as they arrive
                         chunk = data.get("chunk", "")
-                        word_buffer.append(chunk)
-                        char_count += 1
-                        
-                        # Print word by word for natural flow
-                        if chunk in [" ", "\n"]:
-                            word = "".join(word_buffer)
-                            console.print(word, end="", style="bright_green")
-                            word_buffer = []
-                        
-                        # After 50 chars, speed up
-                        elif char_count > 50:
+                        if chunk:
                             console.print(chunk, end="", style="bright_green")
-                            word_buffer = []
-                
-                if word_buffer:
-                    console.print("".join(word_buffer), end="", style="bright_green")
                 
                 console.print("\n" + "─" * 80, style="dim")
                 console.print()
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -16,6 +16,14 @@ class Settings(BaseSettings):
     # Vector Store
     vector_store_path: str = "./data/vectorstore"
     embeddings_model: str = "text-embedding-3-small"
+    rag_cache_ttl: int = 3600
+    rag_warmup_queries: List[str] = []
+    rag_split_then_merge: bool = False
+    rag_parallel_embed: bool = False
+    
+    # Memory
+    max_history_messages: int = 20
+    max_sessions: int = 1000
     
     # Supabase Configuration
     supabase_url: Optional[str] = None
@@ -26,6 +34,7 @@ class Settings(BaseSettings):
     mcp_timeout: int = 30
     
     # API Configuration
+    env: str = "dev"
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     
@@ -34,6 +43,14 @@ class Settings(BaseSettings):
     redis_port: int = 6379
     redis_db: int = 0
     redis_enabled: bool = True
+    redis_max_connections: int = 100
+    redis_async_max_connections: int = 64
+    redis_pool_timeout: int = 5
+    
+    # Semantic Cache
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = 0.9
+    semantic_cache_max_entries: int = 1024
     
     # Rate Limiting
     rate_limit_enabled: bool = True
@@ -1,6 +1,7 @@
 from .models import ModelManager
 from .memory import MemoryManager, memory_manager
 from .rag import RAGManager, rag_manager
+from .splitters import SplitThenMergeSplitter, RustTextSplitter
 from .tools import ToolRegistry, tool_registry
 from .mcp import MCPClient, mcp_client
 from .logger import logger
@@ -14,6 +15,8 @@ __all__ = [
     "memory_manager",
     "RAGManager",
     "rag_manager",
+    "SplitThenMergeSplitter",
+    "RustTextSplitter",
     "ToolRegistry",
     "tool_registry",
     "MCPClient",
@@ -1,13 +1,67 @@
-from typing import Optional, Any
+from typing import Optional, Any, List
 from core.redis_client import redis_client
 from core.logger import logger
-import json
+from config import settings
+import numpy as np
+import orjson
 import hashlib
 
+class SemanticIndex:
+    """Fixed-size ring buffer of unit-norm vectors searched by cosine similarity."""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._vectors: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._next = 0
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def search(self, embedding: List[float], threshold: float) -> Optional[Any]:
+        """Return the value stored for the most similar vector, if above threshold."""
+        if not self._values:
+            return None
+        
+        scores = self._vectors[:len(self._values)] @ self._normalize(embedding)
+        best = int(scores.argmax())
+        return self._values[best] if scores[best] >= threshold else None
+    
+    def add(self, embedding: List[float], value: Any):
+        """Store a value under a vector, overwriting the oldest entry when full."""
+        vector = self._normalize(embedding)
+        if self._vectors is None:
+            self._vectors = np.empty((self.max_entries, vector.shape[0]), dtype=np.float32)
+        
+        # Replace the entry for an identical vector rather than storing it twice
+        if self._values:
+            scores = self._vectors[:len(self._values)] @ vector
+            best = int(scores.argmax())
+            if scores[best] >= 1 - 1e-6:
+                self._values[best] = value
+                return
+        
+        slot = self._next
+        self._vectors[slot] = vector
+        if slot < len(self._values):
+            self._values[slot] = value
+        else:
+            self._values.append(value)
+        self._next = (slot + 1) % self.max_entries
+    
+    def clear(self):
+        self._vectors = None
+        self._values = []
+        self._next = 0
+
 class CacheManager:
-    def __init__(self, prefix: str = "agent:cache"):
+    def __init__(self, prefix: str = "agent:cache", semantic_max_entries: int = settings.semantic_cache_max_entries):
         self.prefix = prefix
         self.client = redis_client.get_async_client()
+        self._semantic = SemanticIndex(semantic_max_entries)
     
     def _make_key(self, key: str) -> str:
         return f"{self.prefix}:{key}"
@@ -18,7 +72,7 @@ class CacheManager:
     async def get(self, key: str) -> Optional[Any]:
         try:
             value = await self.client.get(self._make_key(key))
-            return json.loads(value) if value else None
+            return orjson.loads(value) if value else None
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             return None
@@ -28,7 +82,7 @@ class CacheManager:
             await self.client.setex(
                 self._make_key(key),
                 ttl,
-                json.dumps(value)
+                orjson.dumps(value)
             )
         except Exception as e:
             logger.error(f"Cache set error: {e}")
@@ -47,5 +101,150 @@ class CacheManager:
         value = await factory() if callable(factory) else factory
         await self.set(key, value, ttl)
         return value
+    
+    async def semantic_get(self, embedding: List[float], threshold: float = 0.9) -> Optional[Any]:
+        """Return the value cached for the most similar embedding, if above threshold."""
+        try:
+            return self._semantic.search(embedding, threshold)
+        except Exception as e:
+            logger.error(f"Semantic cache get error: {e}")
+            return None
+    
+    async def semantic_set(self, embedding: List[float], value: Any):
+        """Cache a value under an embedding, overwriting the oldest entry when full."""
+        try:
+            self._semantic.add(embedding, value)
+        except Exception as e:
+            logger.error(f"Semantic cache set error: {e}")
+    
+    async def semantic_clear(self):
+        self._semantic.clear()
+
+class QueryEmbeddingCache:
+    """Two-level cache for RAG queries.
+    
+    Query embeddings are cached in Redis by exact query hash, stored as raw
+    little-endian float32 bytes. Search results are kept in process for the
+    most recent queries and reused for any query whose embedding is close
+    enough to a cached one.
+    """
+    
+    def __init__(
+        self,
+        prefix: str = "agent:embedding:f32",
+        ttl: int = 600,
+        max_results: int = 256,
+        threshold: float = 0.92
+    ):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.threshold = threshold
+        self._results = SemanticIndex(max_results)
+    
+    def _make_key(self, query: str) -> str:
+        return f"{self.prefix}:{hashlib.sha256(query.encode()).hexdigest()}"
+    
+    @staticmethod
+    def _encode(embedding: List[float]) -> bytes:
+        return np.asarray(embedding, dtype="<f4").tobytes()
+    
+    @staticmethod
+    def _decode(value: bytes) -> List[float]:
+        return np.frombuffer(value, dtype="<f4").tolist()
+    
+    def get(self, query: str) -> Optional[List[float]]:
+        if not settings.redis_enabled:
+            return None
+        try:
+            value = redis_client.get_binary_client().get(self._make_key(query))
+            return self._decode(value) if value else None
+        except Exception as e:
+            logger.error(f"Embedding cache get error: {e}")
+            return None
+    
+    def set(self, query: str, embedding: List[float], ttl: Optional[int] = None):
+        if not settings.redis_enabled:
+            return
+        try:
+            redis_client.get_binary_client().setex(self._make_key(query), ttl or self.ttl, self._encode(embedding))
+        except Exception as e:
+            logger.error(f"Embedding cache set error: {e}")
+    
+    async def aget(self, query: str) -> Optional[List[float]]:
+        if not settings.redis_enabled:
+            return None
+        try:
+            value = await redis_client.get_async_binary_client().get(self._make_key(query))
+            return self._decode(value) if value else None
+        except Exception as e:
+            logger.error(f"Embedding cache get error: {e}")
+            return None
+    
+    async def aset(self, query: str, embedding: List[float], ttl: Optional[int] = None):
+        if not settings.redis_enabled:
+            return
+        try:
+            await redis_client.get_async_binary_client().setex(self._make_key(query), ttl or self.ttl, self._encode(embedding))
+        except Exception as e:
+            logger.error(f"Embedding cache set error: {e}")
+    
+    async def aset_many(self, queries: List[str], embeddings: List[List[float]], ttl: Optional[int] = None):
+        """Cache several query embeddings in one pipelined round trip."""
+        if not settings.redis_enabled:
+            return
+        try:
+            async with redis_client.pipeline(binary=True) as pipe:
+                for query, embedding in zip(queries, embeddings):
+                    pipe.setex(self._make_key(query), ttl or self.ttl, self._encode(embedding))
+        except Exception as e:
+            logger.error(f"Embedding cache set error: {e}")
+    
+    def get_results(self, embedding: List[float], k: int) -> Optional[List[Any]]:
+        """Return cached search results for a similar query, if at least k were stored."""
+        cached = self._results.search(embedding, self.threshold)
+        if cached is None or cached[0] < k:
+            return None
+        return cached[1][:k]
+    
+    def set_results(self, embedding: List[float], k: int, results: List[Any]):
+        self._results.add(embedding, (k, results))
+    
+    def invalidate_results(self):
+        self._results.clear()
+
+class GenerationCounter:
+    """Redis counter bumped whenever cached data derived from a source goes stale.
+    
+    Cache keys embed the current generation, so bumping it invalidates every
+    entry at once, across processes, without scanning for keys.
+    """
+    
+    def __init__(self, key: str):
+        self.key = key
+    
+    async def aget(self) -> int:
+        if not settings.redis_enabled:
+            return 0
+        try:
+            return int(await redis_client.get_async_client().get(self.key) or 0)
+        except Exception as e:
+            logger.error(f"Generation get error: {e}")
+            return 0
+    
+    def bump(self):
+        if not settings.redis_enabled:
+            return
+        try:
+            redis_client.get_sync_client().incr(self.key)
+        except Exception as e:
+            logger.error(f"Generation bump error: {e}")
+    
+    async def abump(self):
+        if not settings.redis_enabled:
+            return
+        try:
+            await redis_client.get_async_client().incr(self.key)
+        except Exception as e:
+            logger.error(f"Generation bump error: {e}")
 
 cache_manager = CacheManager()
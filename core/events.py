@@ -1,7 +1,7 @@
 from typing import Dict, Any, Optional, Callable, Awaitable
 from core.redis_client import redis_client
 from core.logger import logger
-import json
+import orjson
 import asyncio
 import uuid
 from datetime import datetime, timezone
@@ -25,7 +25,7 @@ class EventBus:
                 "event_id": event_id,
                 "event_type": event_type,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": json.dumps(data)
+                "data": orjson.dumps(data).decode()
             }
             
             message_id = await self.client.xadd(stream_name, payload)
@@ -35,24 +35,21 @@ class EventBus:
             logger.error(f"Failed to publish event {event_type}: {e}")
             raise
     
-    async def request(self, event_type: str, data: Dict[str, Any], timeout: int = 30) -> Optional[Dict[str, Any]]:
+    async def request(self, event_type: str, data: Dict[str, Any], timeout: float = 30) -> Optional[Dict[str, Any]]:
         correlation_id = str(uuid.uuid4())
         response_stream = f"{self.stream_prefix}:response:{correlation_id}"
         
         try:
             await self.publish(event_type, {**data, "response_stream": response_stream}, correlation_id)
             
-            start_time = asyncio.get_event_loop().time()
-            while asyncio.get_event_loop().time() - start_time < timeout:
-                messages = await self.client.xread({response_stream: "0"}, count=1, block=1000)
-                
-                if messages:
-                    for stream, msg_list in messages:
-                        for msg_id, msg_data in msg_list:
-                            await self.client.delete(response_stream)
-                            return json.loads(msg_data.get("data", "{}"))
-                
-                await asyncio.sleep(0.1)
+            # A single blocking read wakes up as soon as the response lands.
+            # BLOCK must be a positive integer: 0 would wait forever.
+            block = max(1, int(timeout * 1000))
+            messages = await self.client.xread({response_stream: "0"}, count=1, block=block)
+            
+            for stream, msg_list in messages or []:
+                for msg_id, msg_data in msg_list:
+                    return orjson.loads(msg_data.get("data", "{}"))
             
             logger.warning(f"Request timeout for {event_type}")
             return None
@@ -60,7 +57,11 @@ class EventBus:
             logger.error(f"Request failed for {event_type}: {e}")
             return None
         finally:
-            await self.client.delete(response_stream)
+            # Replies and timeouts alike must not leave the per-request stream behind
+            try:
+                await self.client.delete(response_stream)
+            except Exception as e:
+                logger.error(f"Failed to delete response stream {response_stream}: {e}")
     
     def subscribe(self, event_type: str):
         def decorator(handler: Callable[[Dict[str, Any]], Awaitable[None]]):
@@ -87,10 +88,11 @@ class EventBus:
                     consumer_group,
                     consumer_name,
                     streams,
-                    count=10,
-                    block=1000
+                    count=100,
+                    block=5000
                 )
                 
+                acks = []
                 for stream, msg_list in messages:
                     event_type = stream.decode() if isinstance(stream, bytes) else stream
                     event_type = event_type.split(":")[-1]
@@ -99,13 +101,23 @@ class EventBus:
                     if not handler:
                         continue
                     
+                    handled_ids = []
                     for msg_id, msg_data in msg_list:
                         try:
-                            data = json.loads(msg_data.get("data", "{}"))
+                            data = orjson.loads(msg_data.get("data", "{}"))
                             await handler(data)
-                            await self.client.xack(stream, consumer_group, msg_id)
+                            handled_ids.append(msg_id)
                         except Exception as e:
                             logger.error(f"Handler error for {event_type}: {e}")
+                    
+                    if handled_ids:
+                        acks.append((stream, handled_ids))
+                
+                # Ack every stream in the batch with a single round trip
+                if acks:
+                    async with redis_client.pipeline() as pipe:
+                        for stream, handled_ids in acks:
+                            pipe.xack(stream, consumer_group, *handled_ids)
             except Exception as e:
                 if self.running:
                     logger.error(f"Consumer error: {e}")
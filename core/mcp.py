@@ -7,7 +7,15 @@ class MCPClient:
     def __init__(self, server_url: Optional[str] = None, timeout: int = 30):
         self.server_url = server_url or settings.mcp_server_url
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=self.timeout)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=100,
+                keepalive_expiry=30
+            )
+        )
     
     async def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Any:
         """Call an MCP tool on the server."""
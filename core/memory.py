@@ -1,17 +1,52 @@
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.messages import BaseMessage
-from typing import Dict, List
+from collections import OrderedDict, deque
+from typing import Deque, List, Sequence
+from config import settings
+
+
+class BoundedChatMessageHistory(BaseChatMessageHistory):
+    """In-memory chat history that keeps only the most recent messages."""
+    
+    def __init__(self, max_messages: int):
+        self._messages: Deque[BaseMessage] = deque(maxlen=max_messages)
+    
+    @property
+    def messages(self) -> List[BaseMessage]:
+        return list(self._messages)
+    
+    def add_message(self, message: BaseMessage):
+        self._messages.append(message)
+    
+    def add_messages(self, messages: Sequence[BaseMessage]):
+        self._messages.extend(messages)
+    
+    def clear(self):
+        self._messages.clear()
 
 
 class MemoryManager:
-    def __init__(self):
-        self.sessions: Dict[str, BaseChatMessageHistory] = {}
+    def __init__(
+        self,
+        max_messages: int = settings.max_history_messages,
+        max_sessions: int = settings.max_sessions
+    ):
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        # Ordered by last access so the least recently used session is evicted first
+        self.sessions: "OrderedDict[str, BoundedChatMessageHistory]" = OrderedDict()
     
     def get_session_history(self, session_id: str) -> BaseChatMessageHistory:
-        if session_id not in self.sessions:
-            self.sessions[session_id] = ChatMessageHistory()
-        return self.sessions[session_id]
+        history = self.sessions.get(session_id)
+        if history is not None:
+            self.sessions.move_to_end(session_id)
+            return history
+        
+        history = BoundedChatMessageHistory(self.max_messages)
+        self.sessions[session_id] = history
+        if len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return history
     
     def add_message(self, session_id: str, message: BaseMessage):
         history = self.get_session_history(session_id)
@@ -1,28 +1,48 @@
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from core.logger import logger
 import time
 
-async def error_handler_middleware(request: Request, call_next):
-    """Global error handling middleware."""
-    try:
-        response = await call_next(request)
-        return response
-    except Exception as e:
-        logger.error(f"Unhandled error: {str(e)}", exc_info=True)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": "Internal server error"}
-        )
-
-async def logging_middleware(request: Request, call_next):
-    """Request/response logging middleware."""
-    start_time = time.time()
-    logger.info(f"Request: {request.method} {request.url.path}")
+class AppMiddleware:
+    """Request logging and global error handling as a single pure ASGI middleware.
     
-    response = await call_next(request)
+    Reads method and path straight from the scope, so no Request object is built
+    per call, and streamed responses pass through untouched.
+    """
     
-    duration = time.time() - start_time
-    logger.info(f"Response: {response.status_code} - {duration:.2f}s")
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        logger.info(f"Request: {scope['method']} {scope['path']}")
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        response_started = False
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(f"Unhandled error: {str(e)}", exc_info=True)
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": "Internal server error"}
+            )
+            await response(scope, receive, send)
+        
+        duration = time.perf_counter() - start_time
+        logger.info(f"Response: {status_code} - {duration:.2f}s")
@@ -1,27 +1,39 @@
 from langchain_openai import ChatOpenAI
 from langchain_openai import OpenAIEmbeddings
 from config import settings
+from typing import Optional
+
+
+def _build_llm(model_name: Optional[str] = None, temperature: Optional[float] = None, **kwargs) -> ChatOpenAI:
+    """Build a ChatOpenAI from settings; other kwargs go straight to ChatOpenAI."""
+    return ChatOpenAI(
+        model=model_name or settings.model_name,
+        temperature=settings.temperature if temperature is None else temperature,
+        api_key=settings.openai_api_key,
+        **kwargs
+    )
+
+
+def _build_embeddings() -> OpenAIEmbeddings:
+    return OpenAIEmbeddings(
+        model=settings.embeddings_model,
+        api_key=settings.openai_api_key
+    )
 
 
 class ModelManager:
-    _llm_instance = None
-    _embeddings_instance = None
+    _llm_instance = _build_llm()
+    _embeddings_instance = _build_embeddings()
     
     @classmethod
-    def get_llm(cls, **kwargs):
-        if cls._llm_instance is None:
-            cls._llm_instance = ChatOpenAI(
-                model=kwargs.get("model_name", settings.model_name),
-                temperature=kwargs.get("temperature", settings.temperature),
-                api_key=settings.openai_api_key
-            )
+    def get_llm(cls) -> ChatOpenAI:
         return cls._llm_instance
     
     @classmethod
-    def get_embeddings(cls):
-        if cls._embeddings_instance is None:
-            cls._embeddings_instance = OpenAIEmbeddings(
-                model=settings.embeddings_model,
-                api_key=settings.openai_api_key
-            )
+    def build_llm(cls, **kwargs) -> ChatOpenAI:
+        """Build a new LLM with overrides, leaving the shared instance untouched."""
+        return _build_llm(**kwargs)
+    
+    @classmethod
+    def get_embeddings(cls) -> OpenAIEmbeddings:
         return cls._embeddings_instance
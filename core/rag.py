@@ -4,25 +4,84 @@ from langchain_core.documents import Document
 from typing import List, Optional
 from pathlib import Path
 from core.models import ModelManager
+from core.cache import QueryEmbeddingCache, GenerationCounter
+from core.splitters import SplitThenMergeSplitter, RustTextSplitter, RUST_SPLITTER_AVAILABLE, DEFAULT_SEPARATORS
+from core.logger import logger
 from config import settings
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import math
+import uuid
+
+_MAX_EMBED_SHARDS = 8
+_MIN_SHARD_SIZE = 64
+
+# Shared by all managers; threads are only started on first use
+_embed_executor = ThreadPoolExecutor(max_workers=_MAX_EMBED_SHARDS, thread_name_prefix="embed")
 
 
 class RAGManager:
-    def __init__(self, persist_directory: Optional[str] = None):
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        token_budget: int = 100_000,
+        embed_concurrency: int = 8,
+        chunk_size: int = 1000,
+        min_size: int = 100,
+        max_size: int = 1100
+    ):
         self.persist_directory = persist_directory or settings.vector_store_path
         self.embeddings = ModelManager.get_embeddings()
         self.vectorstore = None
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
-        )
+        # Max estimated tokens per embedding request; OpenAI caps a request at
+        # 300k real tokens, which leaves room for estimates that run low
+        self.token_budget = token_budget
+        # Max embedding requests in flight for async ingest
+        self.embed_concurrency = embed_concurrency
+        self.query_cache = QueryEmbeddingCache()
+        # Bumped on ingest; retrieval caches key on it
+        self.generation = GenerationCounter("agent:rag:generation")
+        self.parallel_embed = settings.rag_parallel_embed and self._is_local_cpu_backend()
+        if settings.rag_split_then_merge:
+            self.text_splitter = SplitThenMergeSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=200,
+                min_size=min_size,
+                max_size=max_size
+            )
+        elif RUST_SPLITTER_AVAILABLE:
+            self.text_splitter = RustTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=200
+            )
+        else:
+            # Plain-string separators, kept at the end of the preceding chunk so
+            # sentences keep their full stop instead of the next chunk starting with ". "
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=200,
+                separators=DEFAULT_SEPARATORS,
+                keep_separator="end",
+                is_separator_regex=False
+            )
     
-    def initialize_vectorstore(self):
+    def initialize_vectorstore(self, warmup: bool = False):
+        """Open the Chroma store once; with warmup, also make a first embedding call."""
+        if self.vectorstore is not None:
+            return self.vectorstore
+        
         Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
         self.vectorstore = Chroma(
             persist_directory=self.persist_directory,
             embedding_function=self.embeddings
         )
+        
+        if warmup:
+            # Load the embedder and open its connection before the first query
+            try:
+                self.embeddings.embed_query("warmup")
+            except Exception as e:
+                logger.warning(f"Embedding warmup failed: {e}")
         return self.vectorstore
     
     def add_documents(self, documents: List[Document]):
@@ -30,21 +89,256 @@ class RAGManager:
             self.initialize_vectorstore()
         
         splits = self.text_splitter.split_documents(documents)
-        self.vectorstore.add_documents(splits)
+        texts = [split.page_content for split in splits]
+        metadatas = [split.metadata for split in splits]
+        
+        embeddings = self._embed_texts(texts)
+        self._write_embedded(texts, embeddings, metadatas)
+        self.query_cache.invalidate_results()
+        self.generation.bump()
+        return len(splits)
+    
+    async def aadd_documents(self, documents: List[Document]):
+        if not self.vectorstore:
+            self.initialize_vectorstore()
+        
+        splits = await asyncio.to_thread(self.text_splitter.split_documents, documents)
+        texts = [split.page_content for split in splits]
+        metadatas = [split.metadata for split in splits]
+        
+        embeddings = await self._aembed_texts(texts)
+        await asyncio.to_thread(self._write_embedded, texts, embeddings, metadatas)
+        self.query_cache.invalidate_results()
+        await self.generation.abump()
         return len(splits)
     
     def add_texts(self, texts: List[str], metadatas: Optional[List[dict]] = None):
+        return self.add_documents(self._to_documents(texts, metadatas))
+    
+    async def aadd_texts(self, texts: List[str], metadatas: Optional[List[dict]] = None):
+        return await self.aadd_documents(self._to_documents(texts, metadatas))
+    
+    def _to_documents(self, texts: List[str], metadatas: Optional[List[dict]]) -> List[Document]:
+        return [Document(page_content=text, metadata=meta or {}) 
+                for text, meta in zip(texts, metadatas or [{}] * len(texts))]
+    
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        return self._embed_texts(queries)
+    
+    def _is_local_cpu_backend(self) -> bool:
+        """Sniff for an in-process encoder, e.g. a SentenceTransformer, that is not on a GPU."""
+        client = getattr(self.embeddings, "client", None)
+        if not hasattr(client, "encode"):
+            return False
+        return not str(getattr(client, "device", "cpu")).startswith(("cuda", "mps"))
+    
+    def _count_tokens(self, text: str) -> int:
+        """Estimate tokens at ~4 characters each; the embedder tokenizes exactly itself."""
+        return len(text) // 4 + 1
+    
+    def _pack_batches(self, lengths: List[int], budget: int) -> List[List[int]]:
+        """Group text indices, shortest first, into batches within the token budget."""
+        batches, batch, batch_tokens = [], [], 0
+        for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+            if batch and batch_tokens + lengths[i] > budget:
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(i)
+            batch_tokens += lengths[i]
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in token-budgeted batches, returned in input order."""
+        lengths = [self._count_tokens(text) for text in texts]
+        batches = self._pack_batches(lengths, self.token_budget)
+        
+        def embed(batch: List[int]) -> List[List[float]]:
+            return self.embeddings.embed_documents([texts[i] for i in batch])
+        
+        if self.parallel_embed:
+            # Local encoders release the GIL during inference, so shards run in parallel
+            batches = [shard for batch in batches for shard in self._shard(batch)]
+            results = _embed_executor.map(embed, batches)
+        else:
+            results = map(embed, batches)
+        
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for batch, vectors in zip(batches, results):
+            for i, vector in zip(batch, vectors):
+                embeddings[i] = vector
+        return embeddings
+    
+    def _shard(self, batch: List[int]) -> List[List[int]]:
+        """Split a batch into contiguous, similarly sized shards of at least _MIN_SHARD_SIZE texts."""
+        shards = min(_MAX_EMBED_SHARDS, len(batch) // _MIN_SHARD_SIZE)
+        if shards < 2:
+            return [batch]
+        size = math.ceil(len(batch) / shards)
+        return [batch[i:i + size] for i in range(0, len(batch), size)]
+    
+    async def _aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts as concurrent requests, returned in input order."""
+        lengths = [self._count_tokens(text) for text in texts]
+        # Shrink the per-request budget so small inputs still fan out
+        shard_budget = math.ceil(sum(lengths) / self.embed_concurrency) or 1
+        batches = self._pack_batches(lengths, min(self.token_budget, shard_budget))
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+        
+        async def embed(batch: List[int]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents([texts[i] for i in batch])
+        
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+        
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for batch, vectors in zip(batches, results):
+            for i, vector in zip(batch, vectors):
+                embeddings[i] = vector
+        return embeddings
+    
+    def _write_embedded(self, texts: List[str], embeddings: List[List[float]], metadatas: List[dict]):
+        """Upsert pre-embedded chunks straight into the Chroma collection."""
+        ids = [str(uuid.uuid4()) for _ in texts]
+        
+        # Chroma rejects empty metadata dicts, so those rows go in without metadata
+        groups = {True: [], False: []}
+        for i, metadata in enumerate(metadatas):
+            groups[bool(metadata)].append(i)
+        
+        for has_metadata, indices in groups.items():
+            if not indices:
+                continue
+            extra = {"metadatas": [metadatas[i] for i in indices]} if has_metadata else {}
+            self.vectorstore._collection.upsert(
+                ids=[ids[i] for i in indices],
+                embeddings=[embeddings[i] for i in indices],
+                documents=[texts[i] for i in indices],
+                **extra
+            )
+    
+    def _build_where(self, where: Optional[dict], namespace: Optional[str]) -> Optional[dict]:
+        """Combine a Chroma metadata filter with a namespace scope."""
+        if namespace is None:
+            return where
+        scope = {"namespace": namespace}
+        return {"$and": [where, scope]} if where else scope
+    
+    def similarity_search(self, query: str, k: int = 4, where: Optional[dict] = None, namespace: Optional[str] = None):
         if not self.vectorstore:
             self.initialize_vectorstore()
         
-        documents = [Document(page_content=text, metadata=meta or {}) 
-                    for text, meta in zip(texts, metadatas or [{}] * len(texts))]
-        return self.add_documents(documents)
+        embedding = self.query_cache.get(query)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(query)
+            self.query_cache.set(query, embedding)
+        
+        # Filtered results bypass the results cache, which is keyed on the query alone
+        where = self._build_where(where, namespace)
+        if where:
+            return self.vectorstore.similarity_search_by_vector(embedding, k=k, filter=where)
+        
+        docs = self.query_cache.get_results(embedding, k)
+        if docs is None:
+            docs = self.vectorstore.similarity_search_by_vector(embedding, k=k)
+            self.query_cache.set_results(embedding, k, docs)
+        return docs
+    
+    async def aembed_query(self, query: str) -> List[float]:
+        """Embed a query, going through the query embedding cache."""
+        embedding = await self.query_cache.aget(query)
+        if embedding is None:
+            embedding = await self.embeddings.aembed_query(query)
+            await self.query_cache.aset(query, embedding)
+        return embedding
     
-    def similarity_search(self, query: str, k: int = 4):
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        where: Optional[dict] = None,
+        namespace: Optional[str] = None,
+        embedding: Optional[List[float]] = None
+    ):
+        """Search by query; pass embedding when the caller already embedded it."""
         if not self.vectorstore:
             self.initialize_vectorstore()
-        return self.vectorstore.similarity_search(query, k=k)
+        
+        if embedding is None:
+            embedding = await self.aembed_query(query)
+        
+        where = self._build_where(where, namespace)
+        if where:
+            return await self.vectorstore.asimilarity_search_by_vector(embedding, k=k, filter=where)
+        
+        docs = self.query_cache.get_results(embedding, k)
+        if docs is None:
+            docs = await self.vectorstore.asimilarity_search_by_vector(embedding, k=k)
+            self.query_cache.set_results(embedding, k, docs)
+        return docs
+    
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 4,
+        where: Optional[dict] = None,
+        namespace: Optional[str] = None
+    ) -> List[List[Document]]:
+        """Run several searches with one embedding batch and one vector query."""
+        if not self.vectorstore:
+            self.initialize_vectorstore()
+        
+        unique_queries = list(dict.fromkeys(queries))
+        if not unique_queries:
+            return []
+        
+        where = self._build_where(where, namespace)
+        results = self._query_by_vectors(self.embed_queries(unique_queries), k, where)
+        by_query = dict(zip(unique_queries, results))
+        return [by_query[query] for query in queries]
+    
+    async def asearch_many(
+        self,
+        queries: List[str],
+        k: int = 4,
+        where: Optional[dict] = None,
+        namespace: Optional[str] = None
+    ) -> List[List[Document]]:
+        if not self.vectorstore:
+            self.initialize_vectorstore()
+        
+        unique_queries = list(dict.fromkeys(queries))
+        if not unique_queries:
+            return []
+        
+        where = self._build_where(where, namespace)
+        embeddings = await self._aembed_texts(unique_queries)
+        results = await asyncio.to_thread(self._query_by_vectors, embeddings, k, where)
+        by_query = dict(zip(unique_queries, results))
+        return [by_query[query] for query in queries]
+    
+    def _query_by_vectors(
+        self,
+        embeddings: List[List[float]],
+        k: int,
+        where: Optional[dict] = None
+    ) -> List[List[Document]]:
+        result = self.vectorstore._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=where,
+            include=["documents", "metadatas"]
+        )
+        return [
+            [Document(page_content=text, metadata=metadata or {}) for text, metadata in zip(texts, metadatas)]
+            for texts, metadatas in zip(result["documents"], result["metadatas"])
+        ]
+    
+    async def warm_query_embeddings(self, queries: List[str], ttl: int = 86400):
+        """Embed known queries in one batch and cache them for similarity search."""
+        embeddings = await self.embeddings.aembed_documents(queries)
+        await self.query_cache.aset_many(queries, embeddings, ttl=ttl)
     
     def as_retriever(self, **kwargs):
         if not self.vectorstore:
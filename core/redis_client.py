@@ -1,6 +1,8 @@
-from redis import Redis
-from redis.asyncio import Redis as AsyncRedis
-from typing import Optional, Dict, Any
+from redis import Redis, ConnectionPool
+from redis.asyncio import Redis as AsyncRedis, BlockingConnectionPool
+from redis.asyncio.client import Pipeline as AsyncPipeline
+from typing import Optional, Dict, Any, AsyncIterator
+from contextlib import asynccontextmanager
 from config import settings
 from core.logger import logger
 import json
@@ -8,42 +10,85 @@ import json
 class RedisClient:
     _sync_instance: Optional[Redis] = None
     _async_instance: Optional[AsyncRedis] = None
+    _binary_instance: Optional[Redis] = None
+    _async_binary_instance: Optional[AsyncRedis] = None
+    
+    @classmethod
+    def _connection_kwargs(cls, decode_responses: bool = True) -> Dict[str, Any]:
+        return {
+            "host": settings.redis_host,
+            "port": settings.redis_port,
+            "db": settings.redis_db,
+            "decode_responses": decode_responses,
+            "socket_connect_timeout": 5,
+            "socket_keepalive": True,
+            "health_check_interval": 30
+        }
+    
+    @classmethod
+    def _build_sync_client(cls, decode_responses: bool) -> Redis:
+        pool = ConnectionPool(
+            max_connections=settings.redis_max_connections,
+            **cls._connection_kwargs(decode_responses)
+        )
+        return Redis.from_pool(pool)
+    
+    @classmethod
+    def _build_async_client(cls, decode_responses: bool) -> AsyncRedis:
+        # Blocking pool: callers wait for a free connection instead of opening more
+        pool = BlockingConnectionPool(
+            max_connections=settings.redis_async_max_connections,
+            timeout=settings.redis_pool_timeout,
+            **cls._connection_kwargs(decode_responses)
+        )
+        return AsyncRedis.from_pool(pool)
     
     @classmethod
     def get_sync_client(cls) -> Redis:
         if cls._sync_instance is None:
-            cls._sync_instance = Redis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                db=settings.redis_db,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_keepalive=True,
-                health_check_interval=30
-            )
+            cls._sync_instance = cls._build_sync_client(decode_responses=True)
             logger.info("Redis sync client initialized")
         return cls._sync_instance
     
     @classmethod
     def get_async_client(cls) -> AsyncRedis:
         if cls._async_instance is None:
-            cls._async_instance = AsyncRedis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                db=settings.redis_db,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_keepalive=True,
-                health_check_interval=30
-            )
+            cls._async_instance = cls._build_async_client(decode_responses=True)
             logger.info("Redis async client initialized")
         return cls._async_instance
     
+    @classmethod
+    def get_binary_client(cls) -> Redis:
+        """Sync client returning raw bytes, for values that are not text."""
+        if cls._binary_instance is None:
+            cls._binary_instance = cls._build_sync_client(decode_responses=False)
+            logger.info("Redis binary client initialized")
+        return cls._binary_instance
+    
+    @classmethod
+    def get_async_binary_client(cls) -> AsyncRedis:
+        """Async client returning raw bytes, for values that are not text."""
+        if cls._async_binary_instance is None:
+            cls._async_binary_instance = cls._build_async_client(decode_responses=False)
+            logger.info("Redis async binary client initialized")
+        return cls._async_binary_instance
+    
+    @classmethod
+    @asynccontextmanager
+    async def pipeline(cls, binary: bool = False) -> AsyncIterator[AsyncPipeline]:
+        """Queue commands on a non-transactional pipeline and send them in one round trip on exit."""
+        client = cls.get_async_binary_client() if binary else cls.get_async_client()
+        async with client.pipeline(transaction=False) as pipe:
+            yield pipe
+            await pipe.execute()
+    
     @classmethod
     async def close(cls):
-        if cls._async_instance:
-            await cls._async_instance.aclose()
-        if cls._sync_instance:
-            cls._sync_instance.close()
+        for client in (cls._async_instance, cls._async_binary_instance):
+            if client:
+                await client.aclose()
+        for client in (cls._sync_instance, cls._binary_instance):
+            if client:
+                client.close()
 
 redis_client = RedisClient()
@@ -0,0 +1,139 @@
+from langchain_text_splitters import TextSplitter
+from langchain_core.documents import Document
+from collections import deque
+from typing import List, Optional, Tuple
+import copy
+
+try:
+    from semantic_text_splitter import TextSplitter as _CompiledTextSplitter
+except ImportError:
+    _CompiledTextSplitter = None
+
+RUST_SPLITTER_AVAILABLE = _CompiledTextSplitter is not None
+
+Span = Tuple[int, int]
+
+# Coarsest boundary first: paragraphs, lines, sentences, words, then characters
+DEFAULT_SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+
+class SplitThenMergeSplitter(TextSplitter):
+    """Split text into small segments by separator priority, then greedily merge them.
+    
+    Pass one recursively splits on separators until every segment fits in
+    chunk_size. Pass two merges adjacent segments up to chunk_size, carrying up
+    to chunk_overlap characters of trailing segments into the next chunk.
+    Chunks longer than max_size are then cut, and chunks shorter than min_size
+    are folded into their neighbour when the result stays within max_size + 50.
+    """
+    
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        min_size: int = 100,
+        max_size: int = 1100,
+        separators: Optional[List[str]] = None,
+        **kwargs
+    ):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, **kwargs)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.separators = separators or DEFAULT_SEPARATORS
+    
+    def split_text(self, text: str) -> List[str]:
+        # Work on (start, end) offsets so overlaps and merges never duplicate text
+        spans = self._split_spans(text, 0, len(text), self.separators)
+        spans = self._merge_small(self._split_oversized(self._merge_spans(spans)))
+        
+        chunks = [text[start:end] for start, end in spans]
+        if self._strip_whitespace:
+            chunks = [chunk.strip() for chunk in chunks]
+        return [chunk for chunk in chunks if chunk]
+    
+    def _split_spans(self, text: str, start: int, end: int, separators: List[str]) -> List[Span]:
+        if end - start <= self._chunk_size:
+            return [(start, end)] if end > start else []
+        
+        if not separators or separators[0] == "":
+            return [(i, min(i + self._chunk_size, end)) for i in range(start, end, self._chunk_size)]
+        
+        separator, rest = separators[0], separators[1:]
+        spans, position = [], start
+        while position < end:
+            found = text.find(separator, position, end)
+            stop = end if found == -1 else found + len(separator)
+            spans.extend(self._split_spans(text, position, stop, rest))
+            position = stop
+        return spans
+    
+    def _merge_spans(self, spans: List[Span]) -> List[Span]:
+        chunks: List[Span] = []
+        window: deque = deque()
+        
+        for start, end in spans:
+            if window and end - window[0][0] > self._chunk_size:
+                chunks.append((window[0][0], window[-1][1]))
+                # Keep trailing segments as overlap for the next chunk
+                while window and (
+                    window[-1][1] - window[0][0] > self._chunk_overlap
+                    or end - window[0][0] > self._chunk_size
+                ):
+                    window.popleft()
+            window.append((start, end))
+        
+        if window:
+            chunks.append((window[0][0], window[-1][1]))
+        return chunks
+    
+    def _split_oversized(self, chunks: List[Span]) -> List[Span]:
+        step = max(self._chunk_size - self._chunk_overlap, 1)
+        result: List[Span] = []
+        
+        for start, end in chunks:
+            if end - start <= self.max_size:
+                result.append((start, end))
+                continue
+            
+            position = start
+            while True:
+                result.append((position, min(position + self._chunk_size, end)))
+                if position + self._chunk_size >= end:
+                    break
+                position += step
+        return result
+    
+    def _merge_small(self, chunks: List[Span]) -> List[Span]:
+        merged: List[Span] = []
+        
+        for start, end in chunks:
+            if merged:
+                previous_start, previous_end = merged[-1]
+                is_small = end - start < self.min_size or previous_end - previous_start < self.min_size
+                if is_small and end - previous_start <= self.max_size + 50:
+                    merged[-1] = (previous_start, end)
+                    continue
+            merged.append((start, end))
+        return merged
+
+
+class RustTextSplitter:
+    """Character splitter backed by the optional Rust semantic-text-splitter package.
+    
+    Exposes the same split_text/split_documents interface as LangChain splitters.
+    """
+    
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        if _CompiledTextSplitter is None:
+            raise ImportError("semantic-text-splitter is required for RustTextSplitter")
+        self._splitter = _CompiledTextSplitter(chunk_size, overlap=chunk_overlap)
+    
+    def split_text(self, text: str) -> List[str]:
+        return self._splitter.chunks(text)
+    
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        return [
+            Document(page_content=chunk, metadata=copy.deepcopy(document.metadata))
+            for document in documents
+            for chunk in self._splitter.chunks(document.page_content)
+        ]
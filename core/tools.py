@@ -1,5 +1,52 @@
 from langchain_core.tools import BaseTool, StructuredTool, tool
-from typing import List, Optional
+from langchain_core.utils.function_calling import convert_to_openai_function
+from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+import operator
+import math
+import ast
+
+_ALLOWED_BYTES = b"0123456789+-*/()., "
+
+# Bounds on ** so LLM-supplied input like 9**9**9**9 cannot stall the worker
+_MAX_EXPONENT = 1000
+_MAX_POWER_BITS = 10_000
+
+
+def _power(base: Union[int, float], exponent: Union[int, float]) -> Union[int, float]:
+    if abs(exponent) > _MAX_EXPONENT:
+        raise ValueError("Exponent too large")
+    if abs(base) > 1 and abs(exponent) * math.log2(abs(base)) > _MAX_POWER_BITS:
+        raise ValueError("Result too large")
+    return operator.pow(base, exponent)
+
+
+_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Pow: _power,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos
+}
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str) -> ast.AST:
+    return ast.parse(expression, mode="eval").body
+
+
+def _eval_node(node: ast.AST) -> Union[int, float]:
+    """Evaluate an arithmetic AST, rejecting anything but numbers and operators."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError("Unsupported expression")
 
 
 @tool
@@ -12,10 +59,10 @@ def search_tool(query: str) -> str:
 def calculator_tool(expression: str) -> str:
     """Evaluate a mathematical expression safely."""
     try:
-        allowed_chars = set('0123456789+-*/()., ')
-        if not all(c in allowed_chars for c in expression):
+        # Deleting every allowed byte must leave nothing behind
+        if not expression.isascii() or expression.encode().translate(None, _ALLOWED_BYTES):
             return "Error: Invalid characters in expression"
-        result = eval(expression, {"__builtins__": {}}, {})
+        result = _eval_node(_compile(expression))
         return str(result)
     except Exception as e:
         return f"Error: {str(e)}"
@@ -24,9 +71,13 @@ def calculator_tool(expression: str) -> str:
 class ToolRegistry:
     def __init__(self):
         self.tools: List[BaseTool] = []
+        self._by_name: Dict[str, BaseTool] = {}
+        self._schemas: List[Dict[str, Any]] = []
     
     def register(self, tool: BaseTool):
         self.tools.append(tool)
+        self._by_name[tool.name] = tool
+        self._schemas.append(convert_to_openai_function(tool))
         return tool
     
     def register_function(self, func, name: Optional[str] = None, description: Optional[str] = None):
@@ -41,11 +92,12 @@ class ToolRegistry:
     def get_tools(self) -> List[BaseTool]:
         return self.tools
     
+    def get_openai_schemas(self) -> List[Dict[str, Any]]:
+        """Return OpenAI function schemas for the registered tools, built once at registration."""
+        return self._schemas
+    
     def get_tool_by_name(self, name: str) -> Optional[BaseTool]:
-        for tool in self.tools:
-            if tool.name == name:
-                return tool
-        return None
+        return self._by_name.get(name)
 
 
 tool_registry = ToolRegistry()
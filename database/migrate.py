@@ -1,13 +1,44 @@
 #!/usr/bin/env python3
 """Database migration script for Supabase."""
 import sys
+import hashlib
 from pathlib import Path
+from typing import Dict, Iterator
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logger import logger
 
+SCHEMA_MIGRATIONS_SQL = """-- Track applied migrations
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+"""
+
+def iter_lines(path: Path) -> Iterator[str]:
+    """Yield a migration file line by line without reading it whole."""
+    with open(path, "r", buffering=1 << 16) as f:
+        yield from f
+
+def file_checksum(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def get_applied_migrations() -> Dict[str, str]:
+    """Return recorded checksums by migration file name, or nothing if unavailable."""
+    try:
+        from database.client import supabase_client
+        result = supabase_client.get_client().table("schema_migrations")\
+            .select("version,checksum")\
+            .execute()
+        return {row["version"]: row["checksum"] for row in result.data}
+    except Exception as e:
+        logger.warning(f"Could not read schema_migrations, listing every migration: {e}")
+        return {}
+
 def run_migrations():
-    """Run all SQL migrations in order."""
+    """Print pending SQL migrations in order, skipping files already applied unchanged."""
     migrations_dir = Path(__file__).parent / "migrations"
     migration_files = sorted(migrations_dir.glob("*.sql"))
     
@@ -15,13 +46,34 @@ def run_migrations():
         logger.warning("No migration files found")
         return
     
+    applied = get_applied_migrations()
+    pending = []
+    for migration_file in migration_files:
+        checksum = file_checksum(migration_file)
+        if applied.get(migration_file.name) == checksum:
+            logger.info(f"Skipping {migration_file.name} (already applied)")
+            continue
+        if migration_file.name in applied:
+            logger.warning(f"{migration_file.name} changed since it was applied")
+        pending.append((migration_file, checksum))
+    
+    if not pending:
+        logger.info("All migrations are already applied")
+        return
+    
     logger.info("=== Database Migrations ===\n")
+    sys.stdout.writelines([SCHEMA_MIGRATIONS_SQL, "\n" + "="*80 + "\n\n"])
     
-    for migration_file in migration_files:
+    for migration_file, checksum in pending:
         logger.info(f"Migration: {migration_file.name}")
-        sql = migration_file.read_text()
-        print(sql)
-        print("\n" + "="*80 + "\n")
+        sys.stdout.writelines(iter_lines(migration_file))
+        sys.stdout.writelines([
+            "\n",
+            "INSERT INTO schema_migrations (version, checksum) "
+            f"VALUES ('{migration_file.name}', '{checksum}') "
+            "ON CONFLICT (version) DO UPDATE SET checksum = EXCLUDED.checksum, applied_at = NOW();\n",
+            "\n" + "="*80 + "\n\n"
+        ])
     
     logger.info("To apply these migrations:")
     logger.info("1. Copy the SQL above")
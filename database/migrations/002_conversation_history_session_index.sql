@@ -0,0 +1,10 @@
+-- Composite index for get_session_history: filter by session_id, ordered by created_at then id.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block; run these statements one at a time.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conversation_history_session_created
+    ON conversation_history(session_id, created_at, id);
+
+-- The composite index covers session_id lookups on its own
+DROP INDEX CONCURRENTLY IF EXISTS idx_conversation_history_session_id;
+
+-- Refresh planner statistics so the new index is picked up
+ANALYZE conversation_history;
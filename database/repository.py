@@ -21,12 +21,25 @@ class ConversationRepository:
             logger.error(f"Failed to save message: {e}")
             return None
     
+    def save_messages_bulk(self, rows: List[dict]) -> List[dict]:
+        """Insert several messages, e.g. a user turn and its reply, in one request."""
+        if not rows:
+            return []
+        try:
+            data = [{**row, "metadata": row.get("metadata") or {}} for row in rows]
+            result = self.client.table("conversation_history").insert(data).execute()
+            return result.data or []
+        except Exception as e:
+            logger.error(f"Failed to save messages: {e}")
+            return []
+    
     def get_session_history(self, session_id: str, limit: int = 50) -> List[ConversationHistory]:
         try:
             result = self.client.table("conversation_history")\
-                .select("*")\
+                .select("id,session_id,role,content,metadata,created_at")\
                 .eq("session_id", session_id)\
-                .order("created_at", desc=False)\
+                .order("created_at", desc=False, nullsfirst=False)\
+                .order("id", desc=False)\
                 .limit(limit)\
                 .execute()
             return [ConversationHistory(**item) for item in result.data]
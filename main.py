@@ -1,35 +1,32 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from starlette.middleware import Middleware
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from api import router
+from api import router, limiter
 from config import settings
-from core.middleware import error_handler_middleware, logging_middleware
+from core.middleware import AppMiddleware
 from core.logger import logger
 import uvicorn
 
-limiter = Limiter(key_func=get_remote_address)
-
 app = FastAPI(
     title="AI Agent API",
     description="LangChain + LangGraph AI Agent with RAG, Memory, and MCP",
-    version="1.0.0"
+    version="1.0.0",
+    middleware=[
+        Middleware(AppMiddleware),
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        ),
+    ],
+    exception_handlers={RateLimitExceeded: _rate_limit_exceeded_handler}
 )
 
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.middleware("http")(logging_middleware)
-app.middleware("http")(error_handler_middleware)
 
 app.include_router(router, prefix="/api/v1")
 
@@ -41,14 +38,21 @@ async def startup_event():
     logger.info(f"Server running on {settings.api_host}:{settings.api_port}")
     
     try:
-        from core import ModelManager, redis_client
+        from core import ModelManager, redis_client, rag_manager
         ModelManager.get_llm()
         logger.info("LLM initialized successfully")
         
+        rag_manager.initialize_vectorstore(warmup=True)
+        logger.info("Vector store initialized successfully")
+        
         if settings.redis_enabled:
             redis = redis_client.get_async_client()
             await redis.ping()
             logger.info("Redis connected successfully")
+            
+            if settings.rag_warmup_queries:
+                await rag_manager.warm_query_embeddings(settings.rag_warmup_queries)
+                logger.info(f"Warmed {len(settings.rag_warmup_queries)} query embeddings")
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
 
@@ -66,9 +70,22 @@ async def shutdown_event():
 
 
 if __name__ == "__main__":
+    if settings.env == "prod":
+        # One worker: embedded Chroma is not safe to share across processes,
+        # and the semantic, results and graph caches live in process memory
+        run_config = {
+            "workers": 1,
+            "reload": False,
+            "access_log": False
+        }
+    else:
+        run_config = {"reload": True}
+    
     uvicorn.run(
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        **run_config
     )
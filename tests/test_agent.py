@@ -0,0 +1,98 @@
+import pytest
+import itertools
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from agent import agent_executor
+from core import ModelManager, rag_manager, cache_manager
+from config import settings
+
+class NonStreamingChatModel(BaseChatModel):
+    """Chat model that only returns whole messages, like providers without token streaming."""
+    
+    @property
+    def _llm_type(self) -> str:
+        return "non-streaming"
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="Hello  big\nworld. "))])
+
+@pytest.fixture(autouse=True)
+def stub_retrieval(monkeypatch):
+    async def asimilarity_search(query, k=4, **kwargs):
+        return [Document(page_content="context")]
+    
+    monkeypatch.setattr(rag_manager, "asimilarity_search", asimilarity_search)
+    monkeypatch.setattr(settings, "redis_enabled", False)
+
+async def collect(message: str):
+    return [chunk async for chunk in agent_executor.execute_stream(message, session_id="test")]
+
+@pytest.mark.asyncio
+async def test_execute_stream_forwards_tokens(monkeypatch):
+    """Test LLM tokens are yielded as separate chunks followed by a done marker."""
+    llm = GenericFakeChatModel(messages=itertools.repeat(AIMessage(content="hello there world")))
+    monkeypatch.setattr(ModelManager, "_llm_instance", llm)
+    
+    chunks = await collect("stream tokens")
+    
+    assert len(chunks) > 2
+    assert "".join(chunk["chunk"] for chunk in chunks) == "hello there world"
+    assert all(not chunk["done"] for chunk in chunks[:-1])
+    assert chunks[-1] == {"chunk": "", "done": True, "session_id": "test"}
+
+@pytest.mark.asyncio
+async def test_execute_stream_word_fallback(monkeypatch):
+    """Test a model without token streaming is replayed word by word from the final state."""
+    monkeypatch.setattr(ModelManager, "_llm_instance", NonStreamingChatModel())
+    
+    chunks = await collect("stream fallback")
+    
+    assert [chunk["chunk"] for chunk in chunks[:-1]] == ["Hello  ", "big\n", "world. "]
+    assert chunks[-1]["done"] is True
+
+@pytest.mark.asyncio
+async def test_execute_embeds_query_once(monkeypatch):
+    """Test the semantic cache embedding is reused by retrieval instead of embedding again."""
+    calls = []
+    
+    class CountingEmbeddings:
+        async def aembed_query(self, text):
+            calls.append(text)
+            return [1.0, 0.0, 0.0]
+    
+    async def asimilarity_search(query, k=4, embedding=None, **kwargs):
+        calls.append(embedding)
+        return [Document(page_content="context")]
+    
+    llm = GenericFakeChatModel(messages=itertools.repeat(AIMessage(content="answer")))
+    monkeypatch.setattr(ModelManager, "_llm_instance", llm)
+    monkeypatch.setattr(rag_manager, "embeddings", CountingEmbeddings())
+    monkeypatch.setattr(rag_manager, "asimilarity_search", asimilarity_search)
+    monkeypatch.setattr(settings, "semantic_cache_enabled", True)
+    
+    result = await agent_executor.execute("embed once", session_id="test")
+    
+    assert result["response"] == "answer"
+    assert calls == ["embed once", [1.0, 0.0, 0.0]]
+    await cache_manager.semantic_clear()
+
+@pytest.mark.asyncio
+async def test_retrieval_not_memoised_in_process(monkeypatch):
+    """Test repeated questions see knowledge base changes without a graph-level cache."""
+    contents = ["old"]
+    
+    async def asimilarity_search(query, k=4, **kwargs):
+        return [Document(page_content=contents[0])]
+    
+    llm = GenericFakeChatModel(messages=itertools.repeat(AIMessage(content="answer")))
+    monkeypatch.setattr(ModelManager, "_llm_instance", llm)
+    monkeypatch.setattr(rag_manager, "asimilarity_search", asimilarity_search)
+    monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+    
+    assert (await agent_executor.execute("knowledge"))["context"] == "old"
+    
+    contents[0] = "new"
+    assert (await agent_executor.execute("knowledge"))["context"] == "new"
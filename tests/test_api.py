@@ -23,3 +23,11 @@ def test_clear_memory():
     response = client.delete("/api/v1/memory/test_session")
     assert response.status_code == 200
     assert "message" in response.json()
+
+def test_add_documents_rejects_unknown_fields():
+    """Test document request schema rejects misspelled fields."""
+    response = client.post(
+        "/api/v1/documents",
+        json={"texts": ["Hello"], "metadata": [{"source": "test"}]}
+    )
+    assert response.status_code == 422
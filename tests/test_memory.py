@@ -1,5 +1,5 @@
 import pytest
-from core.memory import memory_manager
+from core.memory import MemoryManager, memory_manager
 from langchain_core.messages import HumanMessage, AIMessage
 
 def test_memory_manager():
@@ -17,3 +17,17 @@ def test_memory_manager():
     memory_manager.clear_session(session_id)
     messages = memory_manager.get_messages(session_id)
     assert len(messages) == 0
+
+def test_memory_manager_bounds():
+    """Test history is capped per session and idle sessions are evicted."""
+    manager = MemoryManager(max_messages=3, max_sessions=2)
+    
+    for i in range(5):
+        manager.add_message("a", HumanMessage(content=str(i)))
+    assert [m.content for m in manager.get_messages("a")] == ["2", "3", "4"]
+    
+    manager.add_message("b", HumanMessage(content="b"))
+    manager.get_messages("a")
+    manager.add_message("c", HumanMessage(content="c"))
+    
+    assert list(manager.sessions) == ["a", "c"]
@@ -0,0 +1,13 @@
+import pytest
+from core.models import ModelManager
+from config import settings
+
+def test_build_llm_forwards_kwargs():
+    """Test build_llm applies overrides on top of settings without touching the shared LLM."""
+    llm = ModelManager.build_llm(temperature=0, max_tokens=5, streaming=True)
+    
+    assert llm.temperature == 0
+    assert llm.max_tokens == 5
+    assert llm.streaming is True
+    assert llm.model_name == settings.model_name
+    assert ModelManager.get_llm() is not llm
@@ -0,0 +1,108 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from core.rag import RAGManager
+from config import settings
+
+class LengthEmbeddings:
+    """Fake embedder whose vector encodes the text, recording each request."""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def embed_documents(self, texts):
+        self.requests.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+def test_pack_batches_respects_budget(tmp_path):
+    """Test batches are packed shortest first without exceeding the token budget."""
+    manager = RAGManager(persist_directory=str(tmp_path))
+    
+    batches = manager._pack_batches([5, 1, 4, 2, 3], budget=6)
+    
+    assert batches == [[1, 3, 4], [2], [0]]
+    assert sorted(i for batch in batches for i in batch) == [0, 1, 2, 3, 4]
+
+def test_embed_texts_returns_input_order(tmp_path):
+    """Test embeddings come back in input order even though batches are length sorted."""
+    manager = RAGManager(persist_directory=str(tmp_path), token_budget=8)
+    manager.embeddings = LengthEmbeddings()
+    texts = ["x" * n for n in (30, 2, 17, 9, 0, 25)]
+    
+    embeddings = manager._embed_texts(texts)
+    
+    assert embeddings == [[float(len(text))] for text in texts]
+    assert len(manager.embeddings.requests) > 1
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """RAGManager on a throwaway Chroma directory with a deterministic fake embedder."""
+    monkeypatch.setattr(settings, "redis_enabled", False)
+    manager = RAGManager(persist_directory=str(tmp_path))
+    manager.embeddings = DeterministicFakeEmbedding(size=16)
+    return manager
+
+def test_add_texts_mixed_metadata(store):
+    """Test rows with and without metadata are both written and retrievable."""
+    assert store.add_texts(["alpha doc", "beta doc"], [{"source": "a"}, {}]) == 2
+    
+    alpha = store.similarity_search("alpha doc", k=1)[0]
+    beta = store.similarity_search("beta doc", k=1)[0]
+    
+    assert (alpha.page_content, alpha.metadata) == ("alpha doc", {"source": "a"})
+    assert (beta.page_content, beta.metadata) == ("beta doc", {})
+    assert store.vectorstore._collection.count() == 2
+
+def test_search_many_dedupes_queries(store, monkeypatch):
+    """Test duplicate queries are embedded once and results map back to input order."""
+    store.add_texts(["alpha doc", "beta doc"])
+    embedded = []
+    embed_queries = store.embed_queries
+    
+    def recording_embed_queries(queries):
+        embedded.extend(queries)
+        return embed_queries(queries)
+    
+    monkeypatch.setattr(store, "embed_queries", recording_embed_queries)
+    
+    results = store.search_many(["beta doc", "alpha doc", "beta doc"], k=1)
+    
+    assert [docs[0].page_content for docs in results] == ["beta doc", "alpha doc", "beta doc"]
+    assert embedded == ["beta doc", "alpha doc"]
+
+@pytest.mark.asyncio
+async def test_search_many_empty_input(store):
+    """Test empty query lists return no results without querying the store."""
+    assert store.search_many([]) == []
+    assert await store.asearch_many([]) == []
+
+def test_build_where_combines_namespace(store):
+    """Test a namespace is ANDed with an existing metadata filter."""
+    assert store._build_where(None, None) is None
+    assert store._build_where({"source": "x"}, None) == {"source": "x"}
+    assert store._build_where(None, "s1") == {"namespace": "s1"}
+    assert store._build_where({"source": "x"}, "s1") == {"$and": [{"source": "x"}, {"namespace": "s1"}]}
+
+@pytest.mark.asyncio
+async def test_filtered_search_scopes_results(store):
+    """Test namespace and where filters are pushed down and bypass the results cache."""
+    store.add_texts(
+        ["one doc", "two doc", "three doc"],
+        [{"namespace": "s1"}, {"namespace": "s2", "source": "x"}, {"namespace": "s2"}]
+    )
+    
+    scoped = store.similarity_search("one doc", k=3, namespace="s2")
+    assert sorted(doc.page_content for doc in scoped) == ["three doc", "two doc"]
+    
+    # Filtered hits must not be cached under the bare query
+    embedding = store.embeddings.embed_query("one doc")
+    assert store.query_cache.get_results(embedding, 1) is None
+    
+    combined = await store.asimilarity_search("one doc", k=3, where={"source": "x"}, namespace="s2")
+    assert [doc.page_content for doc in combined] == ["two doc"]
+    
+    # An unfiltered search still sees every namespace, then is served from the cache
+    assert len(store.similarity_search("one doc", k=3)) == 3
+    assert len(store.similarity_search("one doc", k=3, namespace="s1")) == 1
+    
+    grouped = store.search_many(["one doc", "two doc"], k=3, namespace="s1")
+    assert [[doc.page_content for doc in docs] for docs in grouped] == [["one doc"], ["one doc"]]
@@ -1,7 +1,7 @@
 import pytest
 import pytest_asyncio
 from core.redis_client import redis_client
-from core.cache import cache_manager
+from core.cache import cache_manager, QueryEmbeddingCache, GenerationCounter
 from core.events import event_bus
 
 @pytest_asyncio.fixture
@@ -31,6 +31,26 @@ async def test_cache_operations(redis_conn):
     cached = await cache_manager.get(test_key)
     assert cached is None
 
+@pytest.mark.asyncio
+async def test_redis_pipeline(redis_conn):
+    """Test pipelined commands are flushed on exit."""
+    async with redis_client.pipeline() as pipe:
+        pipe.set("test:pipeline", "value")
+        pipe.expire("test:pipeline", 60)
+    
+    assert await redis_conn.get("test:pipeline") == "value"
+    await redis_conn.delete("test:pipeline")
+
+@pytest.mark.asyncio
+async def test_generation_counter(redis_conn):
+    """Test bumping the generation changes the value cache keys are built from."""
+    counter = GenerationCounter("test:generation")
+    before = await counter.aget()
+    
+    await counter.abump()
+    assert await counter.aget() == before + 1
+    await redis_conn.delete("test:generation")
+
 @pytest.mark.asyncio
 async def test_event_publish(redis_conn):
     """Test event publishing."""
@@ -43,3 +63,35 @@ async def test_event_request_timeout(redis_conn):
     """Test event request with timeout."""
     result = await event_bus.request("nonexistent.event", {"data": "test"}, timeout=2)
     assert result is None
+    assert await redis_conn.keys(f"{event_bus.stream_prefix}:response:*") == []
+
+@pytest.mark.asyncio
+async def test_semantic_cache():
+    """Test semantic cache hit on similar embeddings and miss otherwise."""
+    await cache_manager.semantic_set([1.0, 0.0, 0.0], {"response": "cached"})
+    
+    assert await cache_manager.semantic_get([0.99, 0.05, 0.0], threshold=0.9) == {"response": "cached"}
+    assert await cache_manager.semantic_get([0.0, 1.0, 0.0], threshold=0.9) is None
+    
+    await cache_manager.semantic_clear()
+    assert await cache_manager.semantic_get([1.0, 0.0, 0.0]) is None
+
+def test_query_result_cache():
+    """Test cached search results are reused for near-identical query embeddings."""
+    query_cache = QueryEmbeddingCache(threshold=0.9)
+    query_cache.set_results([1.0, 0.0], 2, ["a", "b"])
+    
+    assert query_cache.get_results([0.99, 0.05], 1) == ["a"]
+    assert query_cache.get_results([0.99, 0.05], 3) is None
+    assert query_cache.get_results([0.0, 1.0], 1) is None
+    
+    query_cache.invalidate_results()
+    assert query_cache.get_results([1.0, 0.0], 1) is None
+
+def test_query_embedding_encoding():
+    """Test embeddings round-trip through the float32 byte encoding."""
+    embedding = [0.5, -1.25, 3.0]
+    encoded = QueryEmbeddingCache._encode(embedding)
+    
+    assert len(encoded) == 4 * len(embedding)
+    assert QueryEmbeddingCache._decode(encoded) == embedding
@@ -0,0 +1,42 @@
+import pytest
+from langchain_core.documents import Document
+from core.splitters import SplitThenMergeSplitter, RustTextSplitter, RUST_SPLITTER_AVAILABLE
+
+def test_split_then_merge_sizes():
+    """Test chunks respect max size and tiny trailing segments are merged."""
+    splitter = SplitThenMergeSplitter(chunk_size=100, chunk_overlap=20, min_size=30, max_size=110)
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * (5 + i * 3) for i in range(10)) + "\n\nEnd."
+    
+    chunks = splitter.split_text(text)
+    
+    assert all(len(chunk) <= 110 + 50 for chunk in chunks)
+    assert all(len(chunk) >= 30 for chunk in chunks)
+    assert chunks[-1].endswith("End.")
+
+def test_split_then_merge_covers_text():
+    """Test every word of the input appears in the output chunks."""
+    splitter = SplitThenMergeSplitter(chunk_size=50, chunk_overlap=10, min_size=10, max_size=60)
+    words = [f"w{i}" for i in range(200)]
+    
+    chunks = splitter.split_text(" ".join(words))
+    
+    assert set(" ".join(chunks).split()) == set(words)
+    assert all(len(chunk) <= 60 for chunk in chunks)
+
+def test_split_then_merge_short_text():
+    """Test short text stays a single chunk."""
+    splitter = SplitThenMergeSplitter()
+    assert splitter.split_text("Hello world.") == ["Hello world."]
+    assert splitter.split_text("") == []
+
+@pytest.mark.skipif(not RUST_SPLITTER_AVAILABLE, reason="semantic-text-splitter not installed")
+def test_rust_splitter_preserves_metadata():
+    """Test the Rust splitter adapter keeps document metadata on every chunk."""
+    splitter = RustTextSplitter(chunk_size=50, chunk_overlap=10)
+    documents = [Document(page_content="word " * 40, metadata={"source": "a"})]
+    
+    chunks = splitter.split_documents(documents)
+    
+    assert len(chunks) > 1
+    assert all(chunk.metadata == {"source": "a"} for chunk in chunks)
+    assert all(len(chunk.page_content) <= 50 for chunk in chunks)
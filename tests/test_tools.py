@@ -11,6 +11,18 @@ def test_calculator_tool_invalid():
     result = calculator_tool.invoke({"expression": "import os"})
     assert "Error" in result
 
+def test_calculator_tool_operators():
+    """Test calculator tool precedence, unary minus and unsupported syntax."""
+    assert calculator_tool.invoke({"expression": "-3 * (4 + 1) / 2"}) == "-7.5"
+    assert calculator_tool.invoke({"expression": "2 ** 10"}) == "1024"
+    assert "Error" in calculator_tool.invoke({"expression": "1, 2"})
+
+def test_calculator_tool_bounds_exponents():
+    """Test oversized powers are rejected instead of stalling the worker."""
+    assert calculator_tool.invoke({"expression": "9**9**9**9"}) == "Error: Exponent too large"
+    assert calculator_tool.invoke({"expression": "((9**999)**999)**999"}) == "Error: Result too large"
+    assert calculator_tool.invoke({"expression": "2**-2"}) == "0.25"
+
 def test_search_tool():
     """Test search tool."""
     result = search_tool.invoke({"query": "test query"})
@@ -23,3 +35,6 @@ def test_tool_registry():
     
     calc = tool_registry.get_tool_by_name("calculator_tool")
     assert calc is not None
+    
+    schemas = tool_registry.get_openai_schemas()
+    assert [schema["name"] for schema in schemas] == [tool.name for tool in tools]